@@ -6,16 +6,166 @@ Supports automatic updates, caching, and flexible include/exclude patterns.
 """
 
 import os
+import re
+import fnmatch
+import hashlib
+import functools
+import time
+import itertools
+import tempfile
+import shutil
 import yaml
 import subprocess
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import List, Dict, Tuple, Optional
+from datetime import datetime
+from typing import List, Dict, Tuple, Optional, Iterator
 import logging
 import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent git operations during update_all
+MAX_UPDATE_WORKERS = 8
+
+# Parallel jobs used when fetching submodules during clone
+SUBMODULE_JOBS = 4
+
+# Seconds between updates for the periodic update frequencies
+UPDATE_INTERVALS = {
+    "hourly": 3600,
+    "daily": 86400,
+}
+
+# Thread pool size and read-ahead window for loading source files
+MAX_READ_WORKERS = 16
+READ_AHEAD = MAX_READ_WORKERS * 4
+
+# Extracted notebook text is cached in this directory alongside each
+# source's local_path, keyed on path, mtime and size
+NOTEBOOK_CACHE_DIRNAME = "_nb_cache"
+
+# Number of extracted notebooks also kept in memory
+NOTEBOOK_MEMORY_CACHE_SIZE = 256
+
+# Records the directories a sparse clone was checked out with. Kept inside
+# .git so it never shows up in the working tree or gets indexed.
+SPARSE_MARKER = Path(".git") / "helpfulbat_sparse_dirs"
+
+# Keep git non-interactive and skip optional index lock/refresh work
+GIT_ENV_OVERRIDES = {
+    "GIT_TERMINAL_PROMPT": "0",
+    "GIT_OPTIONAL_LOCKS": "0",
+}
+
+
+def _run_git(args: List[str]) -> subprocess.CompletedProcess:
+    """
+    Run a git command non-interactively, capturing raw bytes output.
+
+    Uses the v2 wire protocol, which cuts ref advertisement overhead on
+    large remotes. Raises CalledProcessError on failure.
+    """
+    return subprocess.run(
+        ["git", "-c", "protocol.version=2", *args],
+        check=True,
+        capture_output=True,
+        stdin=subprocess.DEVNULL,
+        env={**os.environ, **GIT_ENV_OVERRIDES},
+    )
+
+
+def _compile_path_pattern(pattern: str) -> Optional[List[re.Pattern]]:
+    """
+    Compile a glob pattern for repeated matching against relative paths.
+
+    Mirrors PurePosixPath.match: the pattern matches from the right, one
+    regex per path component. Absolute patterns can never match a relative
+    path, so None is returned for them.
+
+    Returns:
+        Component regexes in reverse order, or None
+    """
+    if pattern.startswith("/"):
+        return None
+    parts = [p for p in pattern.split("/") if p]
+    return [re.compile(fnmatch.translate(p)) for p in reversed(parts)]
+
+
+def _path_matches(rev_parts: Tuple[str, ...], regexes: List[re.Pattern]) -> bool:
+    """Check reversed path components against a compiled pattern"""
+    if len(rev_parts) < len(regexes):
+        return False
+    return all(r.match(part) for r, part in zip(regexes, rev_parts))
+
+
+def _compile_glob(pattern: str) -> List[Optional[re.Pattern]]:
+    """
+    Compile an include pattern into per-component regexes for _walk_matching.
+
+    A '**' component is represented by None and matches zero or more
+    directories, as in Path.glob. Consecutive '**' components are
+    collapsed into one since they match the same paths.
+    """
+    parts: List[Optional[re.Pattern]] = []
+    for part in pattern.split("/"):
+        if not part or part == ".":
+            continue
+        if part == "**":
+            if parts and parts[-1] is None:
+                continue
+            parts.append(None)
+        else:
+            parts.append(re.compile(fnmatch.translate(part)))
+    return parts
+
+
+def _walk_matching(
+    dir_path: str,
+    parts: List[Optional[re.Pattern]],
+    rel_parts: Tuple[str, ...] = ()
+):
+    """
+    Yield (path, rel_parts) for files under dir_path matching parts.
+
+    Walks with os.scandir so each entry's type comes from the cached
+    DirEntry instead of a separate stat call per file.
+    """
+    if not parts:
+        return
+
+    part, rest = parts[0], parts[1:]
+
+    try:
+        with os.scandir(dir_path) as it:
+            entries = list(it)
+    except OSError:
+        return
+
+    if part is None:
+        # '**' matches this directory itself and every directory below it
+        yield from _walk_matching(dir_path, rest, rel_parts)
+        for entry in entries:
+            if entry.is_dir() and not entry.is_symlink():
+                yield from _walk_matching(entry.path, parts, rel_parts + (entry.name,))
+        return
+
+    for entry in entries:
+        if not part.match(entry.name):
+            continue
+        if rest:
+            if entry.is_dir():
+                yield from _walk_matching(entry.path, rest, rel_parts + (entry.name,))
+        elif entry.is_file():
+            yield entry.path, rel_parts + (entry.name,)
+
 
 class ContentSource:
     """Represents a single content source (e.g., a git repository)"""
@@ -26,13 +176,25 @@ class ContentSource:
         self.url = config["url"]
         self.branch = config.get("branch", "main")
         self.local_path = Path(config["local_path"])
+        self._local_path_str = str(self.local_path)
         self.update_frequency = config.get("update_frequency", "daily")
         self.include_paths = config.get("include_paths", [])
+        self._include_globs = [_compile_glob(p) for p in self.include_paths]
         self.exclude_paths = config.get("exclude_paths", [])
+        self._exclude_res = [
+            compiled for compiled in map(_compile_path_pattern, self.exclude_paths)
+            if compiled is not None
+        ]
         self.priority = config.get("priority", 1.0)
         self.source_label = config.get("source_label", self.name)
+        self.submodules = config.get("submodules", False)
+        self.notebook_cache_dir = self.local_path.parent / NOTEBOOK_CACHE_DIRNAME
 
         self.last_update = None
+        self.last_update_ts: Optional[float] = None  # Same instant as epoch seconds
+        self._remote_head_cache: Optional[str] = None
+        self._files_cache: Optional[List[Path]] = None
+        self._files_cache_token: Optional[float] = None
         self._load_update_timestamp()
 
     def _load_update_timestamp(self):
@@ -42,6 +204,7 @@ class ContentSource:
             try:
                 timestamp = float(update_marker.read_text())
                 self.last_update = datetime.fromtimestamp(timestamp)
+                self.last_update_ts = timestamp
             except (ValueError, OSError):
                 pass
 
@@ -49,7 +212,7 @@ class ContentSource:
         """Save update timestamp to disk"""
         update_marker = self.local_path / ".last_update"
         try:
-            update_marker.write_text(str(datetime.now().timestamp()))
+            update_marker.write_text(str(self.last_update_ts))
         except OSError as e:
             logger.warning(f"Could not save update timestamp: {e}")
 
@@ -58,115 +221,322 @@ class ContentSource:
         if not self.local_path.exists():
             return True
 
-        if self.last_update is None:
+        if self.last_update_ts is None:
             return True
 
         if self.update_frequency == "on_startup":
             return False  # Only update once per run
 
-        now = datetime.now()
-        if self.update_frequency == "hourly":
-            return (now - self.last_update) > timedelta(hours=1)
-        elif self.update_frequency == "daily":
-            return (now - self.last_update) > timedelta(days=1)
-        elif self.update_frequency == "never":
-            return False
+        interval = UPDATE_INTERVALS.get(self.update_frequency)
+        if interval is not None:
+            return (time.time() - self.last_update_ts) > interval
 
+        # "never" and unknown frequencies
         return False
 
+    def _rev_parse(self, ref: str) -> str:
+        """Resolve a ref in the local checkout to its commit hash"""
+        result = _run_git(["-C", self._local_path_str, "rev-parse", ref])
+        return result.stdout.strip()[:40].decode("ascii")
+
+    def _local_head(self) -> str:
+        """Commit hash currently checked out"""
+        return self._rev_parse("HEAD")
+
+    def _remote_head(self) -> str:
+        """
+        Fetch the tracked branch and return the commit hash it points to.
+
+        The result is cached until reset_remote_head_cache() is called, so
+        repeated checks within one clone_or_pull() hit the network only once.
+        """
+        if self._remote_head_cache is None:
+            # No --depth here: a depth-limited fetch cuts the history link
+            # to the shallow HEAD and the fast-forward merge would fail
+            _run_git(["-C", self._local_path_str, "fetch", "origin", self.branch])
+            self._remote_head_cache = self._rev_parse("FETCH_HEAD")
+        return self._remote_head_cache
+
+    def reset_remote_head_cache(self):
+        """Forget the cached remote head so the next check fetches again"""
+        self._remote_head_cache = None
+
+    def _sparse_dirs(self) -> Optional[List[str]]:
+        """
+        Directories to check out for a sparse clone, derived from include_paths.
+
+        Each include pattern contributes its leading literal directories
+        (e.g. "docs/beginner/tutorials/*.md" -> "docs/beginner/tutorials").
+        Top-level files are always present in cone mode.
+
+        Returns:
+            Directory list, or None if sparse checkout can't be used (no
+            include paths, or a pattern starts with a wildcard directory)
+        """
+        if not self.include_paths:
+            return None
+
+        dirs = set()
+        for pattern in self.include_paths:
+            parts = [p for p in pattern.split("/") if p and p != "."]
+            literal = []
+            for part in parts[:-1]:
+                if any(c in part for c in "*?["):
+                    break
+                literal.append(part)
+            if len(parts) > 1 and not literal:
+                return None
+            if literal:
+                dirs.add("/".join(literal))
+
+        return sorted(dirs)
+
+    def _apply_sparse_checkout(self, sparse_dirs: List[str]):
+        """Restrict the working tree to sparse_dirs (cone mode) and record it"""
+        _run_git(["-C", self._local_path_str, "sparse-checkout", "init", "--cone"])
+        _run_git(["-C", self._local_path_str, "sparse-checkout", "set", *sparse_dirs])
+        (self.local_path / SPARSE_MARKER).write_text("\n".join(sparse_dirs))
+
+    def _sync_sparse_checkout(self):
+        """
+        Re-apply sparse checkout if include_paths changed since the clone.
+
+        Only clones created sparse (with a marker file) are touched; full
+        clones stay full.
+        """
+        marker = self.local_path / SPARSE_MARKER
+        if not marker.exists():
+            return
+
+        recorded = [d for d in marker.read_text().split("\n") if d]
+        sparse_dirs = self._sparse_dirs()
+
+        if sparse_dirs is None:
+            logger.info(f"Include paths for {self.name} need a full checkout")
+            _run_git(["-C", self._local_path_str, "sparse-checkout", "disable"])
+            marker.unlink()
+        elif recorded != sparse_dirs:
+            logger.info(f"Updating sparse checkout for {self.name}")
+            self._apply_sparse_checkout(sparse_dirs)
+
+    def _checkout_sparse_clone(self, sparse_dirs: List[str]):
+        """
+        Populate a --no-checkout clone, sparse if git supports it.
+
+        Falls back to a full checkout (blobs are then fetched on demand)
+        when sparse-checkout is unavailable, e.g. git < 2.25.
+        """
+        try:
+            self._apply_sparse_checkout(sparse_dirs)
+        except subprocess.CalledProcessError as e:
+            logger.warning(
+                f"Sparse checkout failed for {self.name}, using a full checkout: "
+                f"{e.stderr.decode('utf-8', 'replace').strip()}"
+            )
+            _run_git(["-C", self._local_path_str, "config", "core.sparseCheckout", "false"])
+            (self.local_path / SPARSE_MARKER).unlink(missing_ok=True)
+
+        _run_git(["-C", self._local_path_str, "checkout", self.branch])
+
+        if self.submodules:
+            self._update_submodules()
+
+    def _interrupted_sparse_clone(self) -> bool:
+        """
+        True for a partial clone whose first checkout never happened.
+
+        clone_or_pull removes a sparse clone whose checkout fails, but not
+        one left behind when the process dies between `clone --no-checkout`
+        and `checkout`. Such a clone has no index file yet, and its HEAD
+        already matches the remote, so pulling would never populate it.
+        """
+        git_dir = self.local_path / ".git"
+        if not git_dir.is_dir() or (git_dir / "index").exists():
+            return False
+        try:
+            result = _run_git(["-C", self._local_path_str, "config", "--get", "remote.origin.promisor"])
+        except subprocess.CalledProcessError:
+            return False
+        return result.stdout.strip() == b"true"
+
+    def _update_submodules(self):
+        """Check out submodules at the recorded commits, fetching in parallel"""
+        _run_git([
+            "-C", self._local_path_str,
+            "submodule", "update", "--init", "--recursive",
+            "--depth", "1",
+            "--jobs", str(SUBMODULE_JOBS),
+        ])
+
     def clone_or_pull(self) -> bool:
         """Clone or pull the git repository"""
         logger.info(f"Updating content source: {self.name}")
 
+        # Every update starts from a fresh view of the remote
+        self.reset_remote_head_cache()
+
         try:
+            if self.local_path.exists() and self._interrupted_sparse_clone():
+                logger.warning(f"{self.name} has an unfinished sparse clone, re-cloning")
+                shutil.rmtree(self.local_path)
+
             if not self.local_path.exists():
                 # Clone repository
                 logger.info(f"Cloning {self.url} to {self.local_path}")
                 self.local_path.parent.mkdir(parents=True, exist_ok=True)
 
-                result = subprocess.run([
-                    "git", "clone",
+                sparse_dirs = self._sparse_dirs()
+
+                cmd = [
+                    "clone",
                     "--depth", "1",  # Shallow clone for faster download
                     "--single-branch",
                     "--branch", self.branch,
-                    self.url,
-                    str(self.local_path)
-                ], check=True, capture_output=True, text=True)
+                ]
+                if sparse_dirs is not None:
+                    # Partial clone: only blobs inside the sparse cone are fetched
+                    cmd += ["--filter=blob:none", "--no-checkout"]
+                elif self.submodules:
+                    # Fetch submodules in parallel rather than one by one
+                    cmd += [
+                        "--recurse-submodules",
+                        "--shallow-submodules",
+                        "--jobs", str(SUBMODULE_JOBS),
+                    ]
+                cmd += [self.url, self._local_path_str]
+
+                _run_git(cmd)
+
+                if sparse_dirs is not None:
+                    try:
+                        self._checkout_sparse_clone(sparse_dirs)
+                    except Exception:
+                        # Don't leave a clone without a working tree behind:
+                        # the pull path would treat it as up to date forever
+                        shutil.rmtree(self.local_path, ignore_errors=True)
+                        raise
 
                 logger.info(f"✅ Cloned {self.name}")
 
             else:
-                # Pull latest changes
+                # Fetch first and only merge when the remote has moved on
                 logger.info(f"Pulling latest from {self.name}")
 
-                result = subprocess.run([
-                    "git", "-C", str(self.local_path),
-                    "pull", "--ff-only", "origin", self.branch
-                ], check=True, capture_output=True, text=True)
+                self._sync_sparse_checkout()
 
-                if "Already up to date" in result.stdout:
+                remote_head = self._remote_head()
+                local_head = self._local_head()
+
+                if remote_head == local_head:
                     logger.info(f"✅ {self.name} already up to date")
                 else:
+                    _run_git(["-C", self._local_path_str, "merge", "--ff-only", "FETCH_HEAD"])
+
+                    # Move submodules to the commits the new HEAD records
+                    if self.submodules:
+                        self._update_submodules()
+
                     logger.info(f"✅ Updated {self.name}")
 
             # Mark update time
-            self.last_update = datetime.now()
+            self.last_update_ts = time.time()
+            self.last_update = datetime.fromtimestamp(self.last_update_ts)
             self._save_update_timestamp()
 
+            # Working tree may have changed
+            self.invalidate_files_cache()
+
             return True
 
         except subprocess.CalledProcessError as e:
             logger.error(f"Failed to update {self.name}: {e}")
             if e.stderr:
-                logger.error(f"stderr: {e.stderr}")
+                logger.error(f"stderr: {e.stderr.decode('utf-8', 'replace')}")
             return False
         except Exception as e:
             logger.error(f"Unexpected error updating {self.name}: {e}")
             return False
 
-    def get_files(self) -> List[Path]:
-        """Get all files matching include/exclude patterns"""
-        from pathlib import PurePosixPath
+    def _files_cache_key(self) -> Optional[float]:
+        """Token identifying the current checkout (mtime of the update marker)"""
+        try:
+            return (self.local_path / ".last_update").stat().st_mtime
+        except OSError:
+            return None
+
+    def invalidate_files_cache(self):
+        """Drop the memoized file list so the next get_files() rescans"""
+        self._files_cache = None
+        self._files_cache_token = None
 
+    def _matching_files(self) -> List[Path]:
+        """Memoized scan behind get_files(); callers must not mutate it"""
         if not self.local_path.exists():
             logger.warning(f"Content path does not exist: {self.local_path}")
             return []
 
+        # Reuse the previous scan while the checkout is unchanged
+        token = self._files_cache_key()
+        if self._files_cache is not None and token == self._files_cache_token:
+            return self._files_cache
+
         files = []
 
         # Find all files matching include patterns
-        for pattern in self.include_paths:
-            # Use glob to match patterns
-            for file_path in self.local_path.glob(pattern):
-                if file_path.is_file():
-                    # Get relative path for exclude checking
-                    try:
-                        rel_path = file_path.relative_to(self.local_path)
-                        rel_posix = PurePosixPath(rel_path)
-
-                        # Check against exclude patterns
-                        excluded = False
-                        for exclude_pattern in self.exclude_paths:
-                            if rel_posix.match(exclude_pattern):
-                                excluded = True
-                                break
-
-                        if not excluded:
-                            files.append(file_path)
-                    except ValueError:
-                        # Path is not relative to local_path
-                        pass
+        for parts in self._include_globs:
+            # With several '**' a file can match in more than one way;
+            # Path.glob yields it once, so do the same
+            seen = set() if parts.count(None) > 1 else None
+
+            for path_str, rel_parts in _walk_matching(self._local_path_str, parts):
+                if seen is not None:
+                    if path_str in seen:
+                        continue
+                    seen.add(path_str)
+
+                rev_parts = rel_parts[::-1]
+
+                # Check against precompiled exclude patterns
+                excluded = any(
+                    _path_matches(rev_parts, compiled)
+                    for compiled in self._exclude_res
+                )
+
+                if not excluded:
+                    files.append(Path(path_str))
 
         logger.info(f"Found {len(files)} files in {self.name}")
+
+        self._files_cache = files
+        self._files_cache_token = token
         return files
 
-    def to_dict(self) -> Dict:
-        """Serialize to dictionary"""
+    def get_files(self) -> List[Path]:
+        """Get all files matching include/exclude patterns"""
+        return list(self._matching_files())
+
+    @property
+    def file_count(self) -> int:
+        """Number of matching files, from the memoized scan"""
+        if not self.local_path.exists():
+            return 0
+        return len(self._matching_files())
+
+    def to_dict(self, file_count: Optional[int] = None) -> Dict:
+        """
+        Serialize to dictionary.
+
+        Args:
+            file_count: Precomputed number of files; counted if not given
+        """
+        if file_count is None:
+            file_count = self.file_count
+
         return {
             "name": self.name,
             "url": self.url,
             "branch": self.branch,
-            "file_count": len(self.get_files()) if self.local_path.exists() else 0,
+            "file_count": file_count,
             "last_update": self.last_update.isoformat() if self.last_update else None,
             "priority": self.priority
         }
@@ -179,6 +549,11 @@ class ContentManager:
         self.config_path = Path(config_path)
         self.sources: List[ContentSource] = []
 
+        # Bumped whenever an update succeeds; keys the get_all_files cache
+        self._version = 0
+        self._all_files_cache: Optional[List[Tuple[Path, str, float, str]]] = None
+        self._all_files_key = None
+
         # Load configuration
         if self.config_path.exists():
             self._load_config()
@@ -224,14 +599,22 @@ class ContentManager:
         success = True
         updated_count = 0
 
-        for source in self.sources:
-            if force or source.needs_update():
-                if source.clone_or_pull():
-                    updated_count += 1
-                else:
-                    success = False
+        todo = [source for source in self.sources if force or source.needs_update()]
+
+        # Git operations are network bound, so run them concurrently.
+        # Each source only touches its own state, so no locking is needed.
+        if todo:
+            max_workers = min(len(todo), MAX_UPDATE_WORKERS)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(source.clone_or_pull) for source in todo]
+                for future in as_completed(futures):
+                    if future.result():
+                        updated_count += 1
+                    else:
+                        success = False
 
         if updated_count > 0:
+            self._version += 1
             logger.info(f"Updated {updated_count}/{len(self.sources)} content sources")
         else:
             logger.info("All content sources up to date")
@@ -245,10 +628,15 @@ class ContentManager:
         Returns:
             List of (file_path, source_name, priority, source_label) tuples
         """
+        # Reuse the last result until an update runs or a checkout changes
+        key = (self._version, tuple(source._files_cache_key() for source in self.sources))
+        if self._all_files_cache is not None and key == self._all_files_key:
+            return list(self._all_files_cache)
+
         all_files = []
 
         for source in self.sources:
-            for file_path in source.get_files():
+            for file_path in source._matching_files():
                 all_files.append((
                     file_path,
                     source.name,
@@ -257,14 +645,22 @@ class ContentManager:
                 ))
 
         logger.info(f"Total files from all sources: {len(all_files)}")
-        return all_files
+
+        self._all_files_cache = all_files
+        self._all_files_key = key
+        return list(all_files)
 
     def get_stats(self) -> Dict:
         """Get statistics about content sources"""
+        file_counts = [source.file_count for source in self.sources]
+
         return {
             "source_count": len(self.sources),
-            "sources": [source.to_dict() for source in self.sources],
-            "total_files": len(self.get_all_files())
+            "sources": [
+                source.to_dict(file_count=count)
+                for source, count in zip(self.sources, file_counts)
+            ],
+            "total_files": sum(file_counts)
         }
 
 
@@ -279,8 +675,8 @@ def extract_notebook_text(notebook_path: Path) -> str:
         Extracted text content
     """
     try:
-        with open(notebook_path, 'r', encoding='utf-8') as f:
-            notebook = json.load(f)
+        with open(notebook_path, 'rb') as f:
+            notebook = _loads(f.read())
 
         text_parts = []
         text_parts.append(f"# Jupyter Notebook: {notebook_path.name}\n")
@@ -307,15 +703,127 @@ def extract_notebook_text(notebook_path: Path) -> str:
         return ""
 
 
-def load_files_from_sources(config_path: str = "content_sources.yaml") -> List[Tuple[str, str, Dict]]:
+class _NotebookExtractionFailed(Exception):
+    """Raised out of _cached_notebook_text so lru_cache doesn't keep failures"""
+
+
+@functools.lru_cache(maxsize=NOTEBOOK_MEMORY_CACHE_SIZE)
+def _cached_notebook_text(path_str: str, mtime_ns: int, size: int, cache_dir_str: str) -> str:
+    """Disk-backed notebook extraction; arguments form the cache key"""
+    key = hashlib.sha256(f"{path_str}:{mtime_ns}:{size}".encode()).hexdigest()[:16]
+    cache_file = Path(cache_dir_str) / f"{key}.txt"
+
+    try:
+        return cache_file.read_text(encoding="utf-8")
+    except OSError:
+        pass
+
+    text = extract_notebook_text(Path(path_str))
+
+    # Don't cache failed extractions, on disk or in memory, so they are
+    # retried next time
+    if not text:
+        raise _NotebookExtractionFailed(path_str)
+
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # Unique temp name: several reader threads may cache the same notebook
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=cache_file.parent,
+            prefix=f"{key}.", suffix=".tmp", delete=False
+        ) as tmp:
+            tmp.write(text)
+        os.replace(tmp.name, cache_file)
+    except OSError as e:
+        logger.warning(f"Could not cache notebook text for {path_str}: {e}")
+
+    return text
+
+
+def extract_notebook_text_cached(notebook_path: Path, cache_dir: Path) -> str:
     """
-    Load all files from configured content sources.
+    Extract notebook text, reusing a previous extraction if unchanged.
+
+    Results are cached on disk in cache_dir and in memory, keyed on the
+    notebook's path, modification time and size, so unchanged notebooks
+    cost a single stat instead of a JSON parse.
 
     Args:
-        config_path: Path to content_sources.yaml
+        notebook_path: Path to .ipynb file
+        cache_dir: Directory for cached extractions (see
+            ContentSource.notebook_cache_dir)
 
     Returns:
-        List of (file_path_str, content, metadata) tuples
+        Extracted text content
+    """
+    try:
+        st = notebook_path.stat()
+    except OSError as e:
+        logger.error(f"Failed to extract notebook text from {notebook_path}: {e}")
+        return ""
+
+    try:
+        return _cached_notebook_text(str(notebook_path), st.st_mtime_ns, st.st_size, str(cache_dir))
+    except _NotebookExtractionFailed:
+        return ""
+
+
+def _read_one(
+    file_path: Path,
+    source_name: str,
+    priority: float,
+    source_label: str,
+    notebook_cache_dir: Path
+) -> Optional[Tuple[str, str, Dict]]:
+    """
+    Read one source file into a (file_path_str, content, metadata) tuple.
+
+    Returns:
+        The document, or None if the file is empty or unreadable
+    """
+    try:
+        # Read file content
+        if file_path.suffix.lower() == '.ipynb':
+            content = extract_notebook_text_cached(file_path, notebook_cache_dir)
+        else:
+            # Binary read skips text-mode newline translation
+            with open(file_path, "rb") as f:
+                content = f.read().decode("utf-8", "ignore")
+
+        # Skip empty files
+        if not content.strip():
+            logger.warning(f"Skipping empty file: {file_path}")
+            return None
+
+        # Create metadata
+        metadata = {
+            "file": file_path.name,
+            "full_path": str(file_path),
+            "source": source_name,
+            "source_label": source_label,
+            "priority": priority,
+            "last_modified": file_path.stat().st_mtime
+        }
+
+        return (str(file_path), content, metadata)
+
+    except Exception as e:
+        logger.error(f"Failed to load file {file_path}: {e}")
+        return None
+
+
+def iter_files_from_sources(config_path: str = "content_sources.yaml") -> Iterator[Tuple[str, str, Dict]]:
+    """
+    Load files from configured content sources one at a time.
+
+    Yields documents as they are read so callers can index them without
+    holding the whole corpus in memory.
+
+    Args:
+        config_path: Path to content_sources.yaml
+
+    Yields:
+        (file_path_str, content, metadata) tuples
     """
     content_manager = ContentManager(config_path)
 
@@ -327,35 +835,41 @@ def load_files_from_sources(config_path: str = "content_sources.yaml") -> List[T
     files = content_manager.get_all_files()
     logger.info(f"Loading {len(files)} files for indexing")
 
-    documents = []
+    loaded_count = 0
+    cache_dirs = {source.name: source.notebook_cache_dir for source in content_manager.sources}
 
-    for file_path, source_name, priority, source_label in files:
-        try:
-            # Read file content
-            if file_path.suffix.lower() == '.ipynb':
-                content = extract_notebook_text(file_path)
-            else:
-                content = file_path.read_text(encoding="utf-8", errors="ignore")
+    # Reads are I/O bound, so overlap them across a thread pool. Documents
+    # are still yielded in file order, and only a bounded window of reads
+    # is in flight so memory stays capped.
+    with ThreadPoolExecutor(max_workers=MAX_READ_WORKERS) as executor:
+        pending = deque()
+        file_iter = iter(files)
 
-            # Skip empty files
-            if not content.strip():
-                logger.warning(f"Skipping empty file: {file_path}")
-                continue
+        for file_info in itertools.islice(file_iter, READ_AHEAD):
+            pending.append(executor.submit(_read_one, *file_info, cache_dirs[file_info[1]]))
 
-            # Create metadata
-            metadata = {
-                "file": file_path.name,
-                "full_path": str(file_path),
-                "source": source_name,
-                "source_label": source_label,
-                "priority": priority,
-                "last_modified": file_path.stat().st_mtime
-            }
+        while pending:
+            document = pending.popleft().result()
 
-            documents.append((str(file_path), content, metadata))
+            next_info = next(file_iter, None)
+            if next_info is not None:
+                pending.append(executor.submit(_read_one, *next_info, cache_dirs[next_info[1]]))
+
+            if document is not None:
+                loaded_count += 1
+                yield document
+
+    logger.info(f"Successfully loaded {loaded_count} documents")
 
-        except Exception as e:
-            logger.error(f"Failed to load file {file_path}: {e}")
 
-    logger.info(f"Successfully loaded {len(documents)} documents")
-    return documents
+def load_files_from_sources(config_path: str = "content_sources.yaml") -> List[Tuple[str, str, Dict]]:
+    """
+    Load all files from configured content sources.
+
+    Args:
+        config_path: Path to content_sources.yaml
+
+    Returns:
+        List of (file_path_str, content, metadata) tuples
+    """
+    return list(iter_files_from_sources(config_path))
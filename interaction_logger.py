@@ -12,14 +12,108 @@ Data stored locally in JSON Lines format (.jsonl) for easy processing.
 
 import json
 import os
+import re
+import threading
+import time
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import hashlib
 import logging
 
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # orjson rejects some input json accepts (e.g. ints beyond 64 bits)
+            return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    _loads = json.loads
+
+try:
+    from blake3 import blake3
+
+    def _short_hash(data: bytes) -> str:
+        return blake3(data).hexdigest(length=8)
+except ImportError:
+    def _short_hash(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()[:16]
+
 logger = logging.getLogger(__name__)
 
+# Block size used when reading the interaction log backwards
+REVERSE_READ_BLOCK = 64 * 1024
+
+# Write buffer size for the long-lived interaction log handles
+LOG_BUFFER_SIZE = 64 * 1024
+
+# Persist the rolling stats sidecar every this many interactions
+STATS_PERSIST_INTERVAL = 50
+
+# Persist the ID index sidecar every this many interactions; it is larger
+# than the stats and entries past the last save are re-indexed on startup
+INDEX_PERSIST_INTERVAL = 1000
+
+# Topics tracked for question pattern analysis
+TOPICS = ["mesh", "swarm", "solver", "boundary", "material",
+          "parallel", "units", "function", "variable", "equation",
+          "stokes", "advection", "diffusion", "visualization", "save"]
+
+# One alternation over all topics, matched as substrings like `topic in question`
+TOPIC_RE = re.compile("|".join(map(re.escape, TOPICS)))
+
+
+def _iter_lines_reverse(filepath: Path, block_size: int = REVERSE_READ_BLOCK):
+    """
+    Yield the lines of a file from last to first.
+
+    Reads fixed-size blocks backwards from the end, so only as much of the
+    file is read as the caller consumes. Lines are yielded as bytes without
+    their trailing newline; empty lines are included.
+    """
+    with open(filepath, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        remainder = b""
+
+        while pos > 0:
+            read_size = min(block_size, pos)
+            pos -= read_size
+            f.seek(pos)
+            lines = (f.read(read_size) + remainder).split(b"\n")
+
+            # First piece may continue in the previous block
+            remainder = lines[0]
+            for line in reversed(lines[1:]):
+                yield line
+
+        if remainder:
+            yield remainder
+
+
+# Keys of a doc already in the logged docs_used shape
+_PROJECTED_DOC_KEYS = frozenset(("file", "chunk_id", "relevance_score"))
+
+
+def _project_doc(doc: Dict) -> Dict:
+    """Reduce a retrieved doc to the fields stored in docs_used"""
+    if doc.keys() == _PROJECTED_DOC_KEYS:
+        return doc  # Already projected, e.g. re-logged from a stored record
+    return {
+        "file": doc["file"] if "file" in doc else doc.get("path", "unknown"),
+        "chunk_id": doc.get("doc_id"),
+        "relevance_score": doc.get("score")
+    }
+
 
 class InteractionLogger:
     """
@@ -48,14 +142,187 @@ class InteractionLogger:
         self.feedback_file = self.log_dir / "feedback.jsonl"
 
         # Daily rotation for easier management
-        self.daily_file = self.log_dir / f"interactions_{datetime.now().strftime('%Y-%m-%d')}.jsonl"
+        self._current_date = datetime.now().date()
+        self.daily_file = self._daily_path(self._current_date)
+
+        # Rolling aggregate behind get_stats/get_question_patterns
+        self.stats_file = self.log_dir / "stats.json"
+        self._stats = self._load_stats()
+        self._unsaved_stats = 0
+
+        # In-memory index of interaction_id -> byte range in interactions.jsonl,
+        # saved to a sidecar in batches like the stats
+        self.index_file = self.log_dir / "id_index.json"
+        self._index, self._index_offset = self._load_index()
+        self._unsaved_index = 0
+
+        # Interaction logs stay open; every entry is written as one line
+        self._lock = threading.Lock()
+        self._main_fh = open(self.interactions_file, "ab", buffering=LOG_BUFFER_SIZE)
+        self._daily_fh = None  # Opened on the first entry of each day
 
         logger.info(f"Interaction logger initialized: {self.log_dir}")
 
-    def _generate_id(self, question: str, timestamp: str) -> str:
+    def _daily_path(self, date) -> Path:
+        """Path of the daily interactions file for a given date"""
+        return self.log_dir / f"interactions_{date.strftime('%Y-%m-%d')}.jsonl"
+
+    @staticmethod
+    def _empty_stats() -> Dict:
+        """Fresh rolling stats aggregate"""
+        return {
+            "total": 0,
+            "channels": {},
+            "conf_sum": 0.0,
+            "conf_n": 0,
+            "keywords": {},
+            "earliest": None,
+            "latest": None,
+            "offset": 0  # Bytes of interactions.jsonl already counted
+        }
+
+    def _load_stats(self) -> Dict:
+        """
+        Load the stats sidecar and catch up on any interactions it missed.
+
+        The sidecar records how much of interactions.jsonl it covers, so
+        entries written after the last save are counted from the log. If
+        the log is shorter than that (rotated or replaced), stats are
+        rebuilt from scratch.
+        """
+        stats = self._empty_stats()
+        if self.stats_file.exists():
+            try:
+                stats.update(_loads(self.stats_file.read_bytes()))
+            except (ValueError, OSError) as e:
+                logger.warning(f"Could not load interaction stats, rebuilding: {e}")
+                stats = self._empty_stats()
+
+        if not self.interactions_file.exists():
+            return self._empty_stats()
+
+        if self.interactions_file.stat().st_size < stats["offset"]:
+            stats = self._empty_stats()
+
+        for offset, line in self._iter_log_from(stats["offset"]):
+            stats["offset"] = offset + len(line)
+            try:
+                interaction = _loads(line)
+            except json.JSONDecodeError:
+                continue
+            # Valid JSON that isn't a record (e.g. a stray list) is skipped
+            if isinstance(interaction, dict):
+                self._update_stats(stats, interaction)
+
+        return stats
+
+    def _iter_log_from(self, offset: int):
+        """
+        Yield (offset, line) for complete, non-empty lines of
+        interactions.jsonl starting at a byte offset.
+
+        A partial trailing line is not yielded; it is picked up once the
+        write completes.
+        """
+        with open(self.interactions_file, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                if line.strip():
+                    yield offset, line
+                offset += len(line)
+
+    def _load_index(self) -> Tuple[Dict[str, Tuple[int, int]], int]:
+        """
+        Load the ID index sidecar and index any entries it is missing.
+
+        Like the stats sidecar, the index stores how many bytes of the log
+        it covers and is rebuilt if the log has been truncated or replaced.
+
+        Returns:
+            (index, covered_offset)
+        """
+        index: Dict[str, Tuple[int, int]] = {}
+        covered = 0
+
+        if not self.interactions_file.exists():
+            return index, covered
+
+        if self.index_file.exists():
+            try:
+                data = _loads(self.index_file.read_bytes())
+                covered = int(data["offset"])
+                index = {k: (int(v[0]), int(v[1])) for k, v in data["ids"].items()}
+            except (ValueError, KeyError, TypeError, IndexError, OSError) as e:
+                logger.warning(f"Could not load interaction index, rebuilding: {e}")
+                index, covered = {}, 0
+
+        if self.interactions_file.stat().st_size < covered:
+            index, covered = {}, 0
+
+        for offset, line in self._iter_log_from(covered):
+            covered = offset + len(line)
+            try:
+                interaction = _loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(interaction, dict):
+                continue
+            interaction_id = interaction.get("id")
+            if interaction_id:
+                index[interaction_id] = (offset, len(line))
+
+        return index, covered
+
+    def _save_index(self):
+        """Atomically write the ID index sidecar"""
+        data = {"offset": self._index_offset, "ids": self._index}
+        if self._write_sidecar(self.index_file, data, "interaction index"):
+            self._unsaved_index = 0
+
+    def _write_sidecar(self, path: Path, data: Dict, label: str) -> bool:
+        """Write a JSON sidecar via a temp file and os.replace"""
+        tmp_file = path.with_suffix(".json.tmp")
+        try:
+            tmp_file.write_bytes(_dumps(data))
+            os.replace(tmp_file, path)
+            return True
+        except OSError as e:
+            logger.warning(f"Could not save {label}: {e}")
+            return False
+
+    def _save_stats(self):
+        """Atomically write the stats sidecar"""
+        if self._write_sidecar(self.stats_file, self._stats, "interaction stats"):
+            self._unsaved_stats = 0
+
+    @staticmethod
+    def _update_stats(stats: Dict, interaction: Dict):
+        """Fold one interaction into a stats aggregate"""
+        stats["total"] += 1
+
+        channel = interaction.get("channel", "unknown")
+        stats["channels"][channel] = stats["channels"].get(channel, 0) + 1
+
+        if interaction.get("confidence"):
+            stats["conf_sum"] += interaction["confidence"]
+            stats["conf_n"] += 1
+
+        timestamp = interaction.get("timestamp")
+        if stats["earliest"] is None:
+            stats["earliest"] = timestamp
+        stats["latest"] = timestamp
+
+        question = (interaction.get("question") or "").lower()
+        keywords = stats["keywords"]
+        # Each topic counts at most once per question
+        for topic in set(TOPIC_RE.findall(question)):
+            keywords[topic] = keywords.get(topic, 0) + 1
+
+    def _generate_id(self, question: str, timestamp: float) -> str:
         """Generate a unique ID for an interaction"""
-        content = f"{question}{timestamp}"
-        return hashlib.sha256(content.encode()).hexdigest()[:16]
+        return _short_hash(f"{question}{timestamp}".encode())
 
     def log_interaction(
         self,
@@ -86,8 +353,11 @@ class InteractionLogger:
         Returns:
             interaction_id: Unique ID for this interaction
         """
-        timestamp = datetime.now().isoformat()
-        interaction_id = self._generate_id(question, timestamp)
+        # Read the clock once; the ISO string and date both derive from it
+        ts = time.time()
+        now = datetime.fromtimestamp(ts)
+        timestamp = now.isoformat()
+        interaction_id = self._generate_id(question, ts)
 
         interaction = {
             "id": interaction_id,
@@ -95,14 +365,7 @@ class InteractionLogger:
             "channel": channel,
             "question": question,
             "answer": answer,
-            "docs_used": [
-                {
-                    "file": doc.get("file", doc.get("path", "unknown")),
-                    "chunk_id": doc.get("doc_id"),
-                    "relevance_score": doc.get("score")
-                }
-                for doc in docs_used
-            ],
+            "docs_used": list(map(_project_doc, docs_used)),
             "confidence": confidence,
             "response_time_ms": response_time_ms,
             "user_id": user_id,
@@ -111,9 +374,30 @@ class InteractionLogger:
             "feedback": None  # Will be updated if feedback is provided
         }
 
-        # Write to both main and daily files
-        self._append_jsonl(self.interactions_file, interaction)
-        self._append_jsonl(self.daily_file, interaction)
+        # Serialize once, then write the same line to both main and daily files
+        line = _dumps(interaction) + b"\n"
+
+        with self._lock:
+            today = now.date()
+            if today != self._current_date or self._daily_fh is None:
+                self._rotate_daily(today)
+
+            offset = self._main_fh.tell()
+            self._main_fh.write(line)
+            self._daily_fh.write(line)
+            self.flush()
+
+            self._index[interaction_id] = (offset, len(line))
+            self._index_offset = offset + len(line)
+            self._unsaved_index += 1
+            if self._unsaved_index >= INDEX_PERSIST_INTERVAL:
+                self._save_index()
+
+            self._update_stats(self._stats, interaction)
+            self._stats["offset"] = offset + len(line)
+            self._unsaved_stats += 1
+            if self._unsaved_stats >= STATS_PERSIST_INTERVAL:
+                self._save_stats()
 
         logger.info(f"Logged interaction {interaction_id}: {question[:50]}...")
 
@@ -152,10 +436,91 @@ class InteractionLogger:
         self._append_jsonl(self.feedback_file, feedback)
         logger.info(f"Logged feedback for {interaction_id}: {feedback_type}")
 
+    def _rotate_daily(self, today):
+        """
+        Point the daily log at today's file.
+
+        Called with the lock held the first time an entry is logged on a
+        new date, so a process running across midnight starts a new file.
+        """
+        if self._daily_fh is not None:
+            self._daily_fh.close()
+        self._current_date = today
+        self.daily_file = self._daily_path(today)
+        self._daily_fh = open(self.daily_file, "ab", buffering=LOG_BUFFER_SIZE)
+
+    def flush(self):
+        """Flush buffered interaction log writes to disk"""
+        self._main_fh.flush()
+        if self._daily_fh is not None:
+            self._daily_fh.flush()
+
+    def close(self):
+        """Flush and close the interaction log files"""
+        with self._lock:
+            if self._unsaved_stats:
+                self._save_stats()
+            if self._unsaved_index:
+                self._save_index()
+            self._main_fh.close()
+            if self._daily_fh is not None:
+                self._daily_fh.close()
+                self._daily_fh = None
+
     def _append_jsonl(self, filepath: Path, data: Dict):
         """Append a JSON object as a new line to a file"""
-        with open(filepath, "a", encoding="utf-8") as f:
-            f.write(json.dumps(data, ensure_ascii=False) + "\n")
+        with open(filepath, "ab") as f:
+            f.write(_dumps(data) + b"\n")
+
+    def get_interaction(self, interaction_id: str) -> Optional[Dict]:
+        """
+        Look up a single interaction by ID.
+
+        Uses the ID index to read just that record's byte range instead
+        of scanning the log.
+
+        Returns:
+            The interaction record, or None if the ID is unknown
+        """
+        with self._lock:
+            entry = self._index.get(interaction_id)
+        if entry is None:
+            return None
+
+        offset, length = entry
+        with open(self.interactions_file, "rb") as f:
+            f.seek(offset)
+            line = f.read(length)
+
+        try:
+            interaction = _loads(line)
+        except json.JSONDecodeError:
+            return None
+
+        # Guard against a stale index pointing at a different record
+        if not isinstance(interaction, dict) or interaction.get("id") != interaction_id:
+            return None
+        return interaction
+
+    def _load_feedback(self) -> Dict[str, Dict]:
+        """Latest feedback record per interaction ID"""
+        feedback = {}
+
+        if not self.feedback_file.exists():
+            return feedback
+
+        with open(self.feedback_file, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = _loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(record, dict):
+                    feedback[record.get("interaction_id")] = record
+
+        return feedback
 
     def get_interactions(
         self,
@@ -176,35 +541,43 @@ class InteractionLogger:
         """
         interactions = []
 
-        if not self.interactions_file.exists():
+        if not self.interactions_file.exists() or limit <= 0:
             return interactions
 
-        with open(self.interactions_file, "r", encoding="utf-8") as f:
-            for line in f:
-                if not line.strip():
-                    continue
-                try:
-                    interaction = json.loads(line)
-
-                    # Apply filters
-                    if channel and interaction.get("channel") != channel:
-                        continue
-                    if since and interaction.get("timestamp", "") < since:
-                        continue
-
-                    interactions.append(interaction)
-                except json.JSONDecodeError:
-                    continue
-
-        # Return most recent first
-        interactions.reverse()
-        return interactions[:limit]
+        # Walk the log newest first and stop once enough records match
+        for line in _iter_lines_reverse(self.interactions_file):
+            if not line.strip():
+                continue
+            try:
+                interaction = _loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(interaction, dict):
+                continue
+
+            # Apply filters
+            if channel and interaction.get("channel") != channel:
+                continue
+            if since and interaction.get("timestamp", "") < since:
+                continue
+
+            interactions.append(interaction)
+            if len(interactions) >= limit:
+                break
+
+        # Already most recent first
+        return interactions
 
     def get_stats(self) -> Dict:
         """Get statistics about logged interactions"""
-        interactions = self.get_interactions(limit=10000)
-
-        if not interactions:
+        with self._lock:
+            stats = self._stats
+            total = stats["total"]
+            channels = dict(stats["channels"])
+            conf_sum, conf_n = stats["conf_sum"], stats["conf_n"]
+            earliest, latest = stats["earliest"], stats["latest"]
+
+        if not total:
             return {
                 "total_interactions": 0,
                 "channels": {},
@@ -212,22 +585,13 @@ class InteractionLogger:
                 "date_range": None
             }
 
-        channels = {}
-        confidences = []
-
-        for i in interactions:
-            channel = i.get("channel", "unknown")
-            channels[channel] = channels.get(channel, 0) + 1
-            if i.get("confidence"):
-                confidences.append(i["confidence"])
-
         return {
-            "total_interactions": len(interactions),
+            "total_interactions": total,
             "channels": channels,
-            "avg_confidence": sum(confidences) / len(confidences) if confidences else 0,
+            "avg_confidence": conf_sum / conf_n if conf_n else 0,
             "date_range": {
-                "earliest": interactions[-1].get("timestamp") if interactions else None,
-                "latest": interactions[0].get("timestamp") if interactions else None
+                "earliest": earliest,
+                "latest": latest
             }
         }
 
@@ -237,26 +601,10 @@ class InteractionLogger:
 
         Returns common question types and topics.
         """
-        interactions = self.get_interactions(limit=1000)
-
-        # Simple keyword analysis
-        keywords = {}
-        for i in interactions:
-            question = i.get("question", "").lower()
-
-            # Extract key topics
-            topics = ["mesh", "swarm", "solver", "boundary", "material",
-                     "parallel", "units", "function", "variable", "equation",
-                     "stokes", "advection", "diffusion", "visualization", "save"]
-
-            for topic in topics:
-                if topic in question:
-                    keywords[topic] = keywords.get(topic, 0) + 1
-
-        # Sort by frequency
-        sorted_keywords = sorted(keywords.items(), key=lambda x: x[1], reverse=True)
+        with self._lock:
+            keywords = Counter(self._stats["keywords"])
 
-        return [{"topic": k, "count": v} for k, v in sorted_keywords[:limit]]
+        return [{"topic": k, "count": v} for k, v in keywords.most_common(limit)]
 
     def export_for_training(self, output_file: str = "training_data.jsonl"):
         """
@@ -269,6 +617,7 @@ class InteractionLogger:
         - quality indicators (confidence, feedback)
         """
         interactions = self.get_interactions(limit=10000)
+        feedback = self._load_feedback()
         output_path = self.log_dir / output_file
 
         training_records = []
@@ -278,14 +627,14 @@ class InteractionLogger:
                 "answer": i.get("answer"),
                 "context_files": [d.get("file") for d in i.get("docs_used", [])],
                 "confidence": i.get("confidence"),
-                "feedback": i.get("feedback"),
+                "feedback": i.get("feedback") or feedback.get(i.get("id")),
                 "timestamp": i.get("timestamp")
             }
             training_records.append(record)
 
-        with open(output_path, "w", encoding="utf-8") as f:
+        with open(output_path, "wb") as f:
             for record in training_records:
-                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.write(_dumps(record) + b"\n")
 
         logger.info(f"Exported {len(training_records)} records to {output_path}")
         return str(output_path)
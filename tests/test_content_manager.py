@@ -0,0 +1,109 @@
+"""
+Tests for content_manager's glob walker.
+
+get_files walks sources with a hand-written os.scandir matcher instead of
+Path.glob; these check it returns the same files Path.glob would.
+
+Run with: python -m unittest discover tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from content_manager import ContentSource  # noqa: E402
+
+TREE = [
+    "README.md",
+    "CLAUDE.md",
+    ".hidden.md",
+    "docs/index.md",
+    "docs/beginner/tutorials/01-intro.ipynb",
+    "docs/beginner/tutorials/02-mesh.md",
+    "docs/beginner/tutorials/deep/03-extra.md",
+    "docs/developer/guide.md",
+    "examples/convection.ipynb",
+    "examples/stokes.py",
+    "examples/data/input.py",
+    "tests/test_0001_meshes.py",
+    "tests/test_0700_other.py",
+    "tests/unit/test_0101_inner.py",
+    "a/b/b/c.md",
+    "a/b/c.md",
+    "src/pkg/module.py",
+]
+
+PATTERNS = [
+    # include_paths from content_sources.yaml
+    "docs/beginner/tutorials/*.ipynb",
+    "docs/beginner/tutorials/*.md",
+    "examples/*.ipynb",
+    "examples/*.py",
+    "tests/test_0[0-6]*.py",
+    "README.md",
+    "CLAUDE.md",
+    # recursive patterns
+    "**/*.md",
+    "**/*",
+    "**",
+    "docs/**/*.md",
+    "docs/**/**/*.md",
+    "a/**/b/**/c.md",
+    "**/**/*.py",
+    # leading ./ and wildcards
+    "./*.md",
+    "./docs/*.md",
+    "*/*.py",
+    "*.md",
+    # through a symlinked directory
+    "linked/*.md",
+    "linked/**/*.md",
+]
+
+
+class WalkMatchesPathGlobTest(unittest.TestCase):
+    """get_files() agrees with Path.glob + is_file() for each include pattern"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.root = Path(cls._tmp.name) / "repo"
+        for rel in TREE:
+            path = cls.root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(rel)
+        os.symlink(cls.root / "docs", cls.root / "linked", target_is_directory=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._tmp.cleanup()
+
+    def _source(self, pattern: str) -> ContentSource:
+        return ContentSource({
+            "name": "test",
+            "type": "git",
+            "url": "unused",
+            "local_path": str(self.root),
+            "include_paths": [pattern],
+        })
+
+    def test_matches_path_glob(self):
+        for pattern in PATTERNS:
+            with self.subTest(pattern=pattern):
+                expected = sorted(
+                    str(p) for p in self.root.glob(pattern) if p.is_file()
+                )
+                actual = sorted(str(p) for p in self._source(pattern).get_files())
+                self.assertEqual(actual, expected)
+
+    def test_repeated_double_star_yields_each_file_once(self):
+        files = self._source("docs/**/**/*.md").get_files()
+        self.assertEqual(len(files), len(set(files)))
+
+
+if __name__ == "__main__":
+    unittest.main()